@@ -2,5 +2,5 @@ class EmptyResponseFromApiError(Exception):
     pass
 
 
-class NotAvaliableError:
+class NotAvaliableError(Exception):
     pass
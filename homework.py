@@ -1,32 +1,43 @@
 """Бот для проверки статуса домашнего задания, отправленного на проверку."""
+import gzip
 import logging
+import logging.config
 import os
+import shutil
+import signal
 import time
 from http import HTTPStatus
-from logging import StreamHandler
 from logging.handlers import RotatingFileHandler
 
 import requests
 import telegram
+from cachetools import TTLCache, cached
 from dotenv import load_dotenv
 
 from custom_errors import EmptyResponseFromApiError, NotAvaliableError
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = RotatingFileHandler(
-    __file__ + '.log', maxBytes=50000000, backupCount=5, encoding='utf-8'
-)
-logger.addHandler(handler)
-formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(lineno)s'
-    '- %(message)s'
-)
-handler.setFormatter(formatter)
 
-handler_stream = StreamHandler()
-logger.addHandler(handler_stream)
-handler_stream.setFormatter(formatter)
+_stop_requested = False
+_sleeping = False
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """Ротируемый файл логов, архивные копии которого сжимаются gzip."""
+
+    def rotation_filename(self, default_name):
+        """Добавляет расширение .gz к имени архивной копии."""
+        return default_name + '.gz'
+
+    def rotate(self, source, dest):
+        """Сжимает текущий файл логов в архивную копию и удаляет его."""
+        if not os.path.exists(source):
+            return
+        with open(source, 'rb') as source_file:
+            with gzip.open(dest, 'wb') as dest_file:
+                shutil.copyfileobj(source_file, dest_file)
+        os.remove(source)
+
 
 load_dotenv()
 
@@ -35,14 +46,78 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
+REQUEST_TIMEOUT = (5, 25)
+SEND_MESSAGE_TIMEOUT = 20
+TELEGRAM_MESSAGE_LIMIT = 4096
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+LOG_FORMAT = (
+    '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(lineno)s'
+    '- %(message)s'
+)
+LOGGING_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {'format': LOG_FORMAT},
+    },
+    'handlers': {
+        'file': {
+            '()': GzipRotatingFileHandler,
+            'formatter': 'default',
+            'filename': __file__ + '.log',
+            'maxBytes': 5000000,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+        'stream': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'default',
+        },
+    },
+    'loggers': {
+        __name__: {
+            'level': 'DEBUG',
+            'handlers': ['file', 'stream'],
+        },
+    },
+}
+
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+STATUS_TEMPLATES = {
+    status: f'Изменился статус проверки работы "{{name}}". {verdict}'
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
+STATUS_CACHE_SIZE = 256
+STATUS_CACHE_TTL = 3600
+
+
+def setup_logging():
+    """Настраивает логирование бота: вывод в консоль и в ротируемый файл.
+    Вызывается один раз при запуске бота, а не при импорте модуля, чтобы
+    повторные импорты не добавляли обработчики повторно.
+    """
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+
+def handle_stop_signal(signum, frame):
+    """Запрашивает остановку бота по сигналу SIGTERM.
+    Обработчик только выставляет флаг: цикл в main() завершается перед
+    следующим опросом API. Если сигнал пришёл во время ожидания
+    RETRY_PERIOD, ожидание прерывается исключением SystemExit, чтобы не
+    ждать до конца паузы; отправка сообщений и ротация логов не
+    прерываются.
+    """
+    global _stop_requested
+    _stop_requested = True
+    if _sleeping:
+        raise SystemExit(0)
 
 
 def check_tokens():
@@ -50,20 +125,17 @@ def check_tokens():
     Если отсутствует хотя бы одна переменная окружения — продолжать работу
     бота нет смысла.
     """
-    tokens_tuple = (
+    tokens = (
         ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
         ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
         ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID),
     )
-    availability = True
-    for token_name, token_value in tokens_tuple:
-        if not token_value:
-            logger.critical(f'Отсутствует токен {token_name}')
-            availability = False
-    if availability is False:
-        error_message = 'Отсутствует переменная окружения.'
-        logger.critical(error_message)
-        raise ValueError(error_message)
+    missing_tokens = ', '.join(
+        token_name for token_name, token_value in tokens if not token_value
+    )
+    if missing_tokens:
+        logger.critical('Отсутствуют переменные окружения: %s', missing_tokens)
+        raise ValueError(f'Отсутствуют переменные окружения: {missing_tokens}')
 
 
 def send_message(bot, message):
@@ -73,11 +145,13 @@ def send_message(bot, message):
     """
     logger.debug('Отправка сообщения')
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
-    except telegram.error.TelegramError(message) as error:
+        bot.send_message(
+            TELEGRAM_CHAT_ID, message, timeout=SEND_MESSAGE_TIMEOUT
+        )
+    except telegram.error.TelegramError as error:
         logger.error(error, exc_info=True)
         return False
-    logger.debug(f'Успешно отправлено сообщение "{message}"')
+    logger.debug('Успешно отправлено сообщение "%s"', message)
     return True
 
 
@@ -87,23 +161,26 @@ def get_api_answer(timestamp):
     успешного запроса должна вернуть ответ API, приведя его из формата JSON
     к типам данных Python.
     """
-    api_data_dict = {
-        'url': ENDPOINT,
-        'headers': HEADERS,
-        'params': {'from_date': timestamp}
-    }
-    logger.debug('Запрос к {url} с параметрами '
-                 '{params}'.format(**api_data_dict))
+    params = {'from_date': timestamp}
+    logger.debug('Запрос к %s с параметрами %s', ENDPOINT, params)
     try:
-        response = requests.get(**api_data_dict)
-    except requests.RequestException:
-        raise ConnectionError(
-            '{url}, {headers}, {params}'.format(**api_data_dict)
+        response = requests.get(
+            ENDPOINT,
+            headers=HEADERS,
+            params=params,
+            timeout=REQUEST_TIMEOUT,
         )
+    except requests.RequestException as error:
+        raise ConnectionError(
+            f'Ошибка запроса к {ENDPOINT} с параметрами {params}: '
+            f'{error}'
+        ) from error
     if response.status_code != HTTPStatus.OK:
         raise NotAvaliableError('Api недоступен')
-
-    return response.json()
+    try:
+        return response.json()
+    except ValueError as error:
+        raise ValueError(f'Ответ API не в формате JSON: {error}') from error
 
 
 def check_response(response):
@@ -122,6 +199,17 @@ def check_response(response):
     return homeworks
 
 
+@cached(cache=TTLCache(maxsize=STATUS_CACHE_SIZE, ttl=STATUS_CACHE_TTL))
+def build_status_message(homework_name, homework_status):
+    """Собирает сообщение об изменении статуса по готовому шаблону.
+    Принимает уже проверенные название работы (строкой) и статус; результат
+    кешируется, так как API повторно возвращает одну и ту же работу.
+    """
+    return STATUS_TEMPLATES[homework_status].format_map(
+        {'name': homework_name}
+    )
+
+
 def parse_status(homework):
     """Извлекает из информации о конкретной домашней работе статус этой работы.
     В качестве параметра функция получает только один элемент из списка
@@ -136,47 +224,117 @@ def parse_status(homework):
         raise KeyError(
             f'Ошибка {error}: Отсутствует ожидаемый ключ в ответе Api'
         )
-    if homework_status not in HOMEWORK_VERDICTS:
+    if homework_status not in STATUS_TEMPLATES:
         raise ValueError(
             f'Неожиданное принятое значение статуса - {homework_status}'
         )
-    verdict = HOMEWORK_VERDICTS[homework_status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return build_status_message(str(homework_name), homework_status)
+
+
+def parse_statuses(homeworks):
+    """Готовит сообщения о статусах всех домашних работ из ответа API.
+    Работы с некорректными данными логируются и пропускаются, чтобы не
+    блокировать отправку остальных. Если корректных работ нет совсем,
+    выбрасывает ValueError.
+    """
+    messages = []
+    for homework in homeworks:
+        try:
+            messages.append(parse_status(homework))
+        except (KeyError, TypeError, ValueError) as error:
+            logger.error('Пропущена домашняя работа %s: %s', homework, error)
+    if not messages:
+        raise ValueError('В ответе API нет корректных домашних работ')
+    return messages
+
+
+def split_message(messages):
+    """Объединяет сообщения в части не длиннее TELEGRAM_MESSAGE_LIMIT.
+    Части разбиваются только по границам сообщений; единственное сообщение,
+    превышающее лимит, обрезается с предупреждением в логе.
+    """
+    parts = []
+    current_part = ''
+    for message in messages:
+        if len(message) > TELEGRAM_MESSAGE_LIMIT:
+            logger.warning(
+                'Сообщение длиннее %s символов обрезано',
+                TELEGRAM_MESSAGE_LIMIT
+            )
+            message = message[:TELEGRAM_MESSAGE_LIMIT]
+        candidate = f'{current_part}\n\n{message}' if current_part else message
+        if len(candidate) > TELEGRAM_MESSAGE_LIMIT:
+            parts.append(current_part)
+            candidate = message
+        current_part = candidate
+    parts.append(current_part)
+    return parts
+
+
+def send_new_parts(bot, parts, sent_part_hashes):
+    """Отправляет по порядку части сообщения, которые ещё не были отправлены.
+    Хеши отправленных частей сохраняются в sent_part_hashes, поэтому после
+    сбоя посередине пакета повторная попытка продолжает с первой
+    неотправленной части. Возвращает True, если отправлены все части.
+    """
+    for part in parts:
+        part_hash = hash(part)
+        if part_hash in sent_part_hashes:
+            continue
+        if not send_message(bot, part):
+            return False
+        sent_part_hashes.add(part_hash)
+    return True
 
 
 def main():
     """Основная логика работы бота."""
+    global _sleeping
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    timestamp = 0
-    current_report = dict()
-    previous_report = dict()
-    while True:
+    timestamp = int(time.time())
+    last_message_hash = None
+    sent_part_hashes = set()
+    while not _stop_requested:
         try:
             api_answer = get_api_answer(timestamp)
             homeworks = check_response(api_answer)
             if homeworks:
-                current_report['message'] = parse_status(homeworks[0])
+                messages = parse_statuses(homeworks)
             else:
-                current_report['message'] = 'Нет новых статусов'
-            if previous_report != current_report:
-                if send_message(bot, current_report['message']):
-                    previous_report = current_report.copy()
+                messages = ['Нет новых статусов']
+            message_hash = hash(tuple(messages))
+            if message_hash != last_message_hash:
+                parts = split_message(messages)
+                if send_new_parts(bot, parts, sent_part_hashes):
+                    sent_part_hashes.clear()
+                    last_message_hash = message_hash
                     timestamp = api_answer.get('current_date', timestamp)
             else:
                 logger.debug('Нет новых статусов')
+                timestamp = api_answer.get('current_date', timestamp)
         except EmptyResponseFromApiError as error:
             logger.error(error, exc_info=True)
         except Exception as error:
+            logger.error('Сбой в работе программы: %s', error)
             message = f'Сбой в работе программы: {error}'
-            current_report['message'] = message
-            logger.error(message)
-            if previous_report != current_report:
-                previous_report = current_report.copy()
-                send_message(bot, current_report['message'])
+            message_hash = hash(message)
+            if message_hash != last_message_hash:
+                last_message_hash = message_hash
+                send_message(bot, message)
+        _sleeping = True
+        try:
+            if not _stop_requested:
+                time.sleep(RETRY_PERIOD)
+        except SystemExit:
+            if not _stop_requested:
+                raise
         finally:
-            time.sleep(RETRY_PERIOD)
+            _sleeping = False
+    logger.info('Бот остановлен по сигналу')
 
 
 if __name__ == '__main__':
+    setup_logging()
+    signal.signal(signal.SIGTERM, handle_stop_signal)
     main()
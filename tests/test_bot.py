@@ -1,7 +1,10 @@
+import gzip
 import inspect
 import logging
+import os
 import platform
 import re
+import signal
 import time
 from http import HTTPStatus
 
@@ -278,6 +281,36 @@ class TestHomework:
         except Exception:
             pass
 
+    @pytest.mark.parametrize('response', NOT_OK_RESPONSES.values())
+    def test_get_not_200_status_response_raises_not_available(
+            self, monkeypatch, current_timestamp, response, homework_module
+    ):
+        monkeypatch.setattr(requests, 'get', response)
+        with pytest.raises(homework_module.NotAvaliableError):
+            homework_module.get_api_answer(current_timestamp)
+
+    def test_get_api_answer_request_exception_hides_token(
+            self, current_timestamp, monkeypatch, homework_module
+    ):
+        secret_token = 'secret-practicum-token'
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', secret_token)
+        monkeypatch.setattr(
+            homework_module,
+            'HEADERS',
+            {'Authorization': f'OAuth {secret_token}'}
+        )
+
+        def mock_request_get_with_exception(*args, **kwargs):
+            raise requests.RequestException('Something wrong')
+
+        monkeypatch.setattr(requests, 'get', mock_request_get_with_exception)
+        with pytest.raises(Exception) as error:
+            homework_module.get_api_answer(current_timestamp)
+        assert secret_token not in str(error.value), (
+            'Убедитесь, что текст ошибки запроса к API не содержит токен '
+            'из заголовка `Authorization`.'
+        )
+
     def test_parse_status_with_expected_statuses(self, homework_module):
         func_name = 'parse_status'
         utils.check_function(
@@ -490,6 +523,32 @@ class TestHomework:
                 'метод бота `send_message`.'
             )
 
+    def test_send_message_with_telegram_exception(self, monkeypatch,
+                                                  random_message,
+                                                  caplog, homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+
+        class MockedBotWithException(utils.MockTelegramBot):
+            def send_message(self, *args, **kwargs):
+                raise telegram.error.TelegramError('Something wrong')
+
+        bot = MockedBotWithException()
+        with utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что ошибка отправки сообщения в Telegram '
+                'логируется с уровнем `ERROR`.'
+        )):
+            try:
+                result = homework_module.send_message(bot, random_message)
+            except Exception as e:
+                raise AssertionError(
+                    'Убедитесь, что функция `send_message` обрабатывает '
+                    'исключение `telegram.error.TelegramError`.'
+                ) from e
+        assert result is False, (
+            'Убедитесь, что функция `send_message` возвращает `False`, '
+            'если сообщение не удалось отправить.'
+        )
+
     def test_bot_initialized_in_main(self, homework_module):
         func_name = 'main'
         utils.check_function(
@@ -773,6 +832,345 @@ class TestHomework:
                     'возникновении ошибки отправки сообщения в Телеграм.'
                 ) from e
 
+    def test_main_send_one_message_with_several_statuses(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        response_data = {
+            'homeworks': [
+                {
+                    'homework_name': 'hw123',
+                    'status': 'approved'
+                },
+                {
+                    'homework_name': 'hw456',
+                    'status': 'rejected'
+                }
+            ],
+            'current_date': random_timestamp
+        }
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module,
+            response_data=response_data
+        )
+        sent_messages = []
+
+        def mock_send_message(bot, message=''):
+            sent_messages.append(message)
+            return True
+
+        monkeypatch.setattr(
+            homework_module,
+            'send_message',
+            mock_send_message
+        )
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert len(sent_messages) == 1, (
+            'Убедитесь, что статусы всех домашних работ из одного ответа API '
+            'отправляются одним сообщением.'
+        )
+        for status in ('approved', 'rejected'):
+            assert self.HOMEWORK_VERDICTS[status] in sent_messages[0], (
+                'Убедитесь, что в сообщение попадают статусы всех домашних '
+                'работ из ответа API.'
+            )
+
+    def test_main_skip_invalid_homework(self, monkeypatch, random_timestamp,
+                                        current_timestamp, random_message,
+                                        homework_module):
+        response_data = {
+            'homeworks': [
+                {
+                    'homework_name': 'hw123',
+                    'status': 'approved'
+                },
+                {
+                    'homework_name': 'hw456',
+                    'status': 'unknown'
+                }
+            ],
+            'current_date': random_timestamp
+        }
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module,
+            response_data=response_data
+        )
+        sent_messages = []
+
+        def mock_send_message(bot, message=''):
+            sent_messages.append(message)
+            return True
+
+        monkeypatch.setattr(
+            homework_module,
+            'send_message',
+            mock_send_message
+        )
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert sent_messages, (
+            'Убедитесь, что некорректная домашняя работа в ответе API '
+            'не блокирует отправку статусов остальных работ.'
+        )
+        assert self.HOMEWORK_VERDICTS['approved'] in sent_messages[0]
+        assert 'hw456' not in sent_messages[0]
+
+    def test_main_first_poll_does_not_send_history(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        history = {
+            'homeworks': [
+                {
+                    'homework_name': f'hw{number}',
+                    'status': 'approved'
+                }
+                for number in range(10)
+            ],
+            'current_date': random_timestamp
+        }
+        from_dates = []
+
+        def mock_response_get(*args, **kwargs):
+            from_date = int(kwargs['params']['from_date'])
+            from_dates.append(from_date)
+            return utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                data=history if from_date == 0 else None
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        sent_messages = []
+
+        def mock_send_message(bot, message=''):
+            sent_messages.append(message)
+            return True
+
+        monkeypatch.setattr(
+            homework_module,
+            'send_message',
+            mock_send_message
+        )
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert from_dates and from_dates[0] != 0, (
+            'Убедитесь, что при запуске бот запрашивает статусы начиная с '
+            'текущего момента, а не всю историю домашних работ.'
+        )
+        assert not any('hw0' in message for message in sent_messages), (
+            'Убедитесь, что при запуске бот не отправляет всю историю '
+            'домашних работ.'
+        )
+
+    def test_main_resend_only_unsent_parts(self, monkeypatch,
+                                           random_timestamp,
+                                           current_timestamp,
+                                           random_message,
+                                           homework_module):
+        response_data = {
+            'homeworks': [
+                {
+                    'homework_name': 'hw123',
+                    'status': 'approved'
+                },
+                {
+                    'homework_name': 'hw456',
+                    'status': 'rejected'
+                }
+            ],
+            'current_date': random_timestamp
+        }
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module,
+            response_data=response_data
+        )
+        monkeypatch.setattr(homework_module, 'TELEGRAM_MESSAGE_LIMIT', 100)
+        sleep_calls = []
+
+        def sleep_twice(secs):
+            sleep_calls.append(secs)
+            if len(sleep_calls) == 2:
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(time, 'sleep', sleep_twice)
+        sent_messages = []
+        send_attempts = []
+
+        def mock_send_message(bot, message=''):
+            send_attempts.append(message)
+            if len(send_attempts) == 2:
+                return False
+            sent_messages.append(message)
+            return True
+
+        monkeypatch.setattr(
+            homework_module,
+            'send_message',
+            mock_send_message
+        )
+        try:
+            homework_module.main()
+        except utils.BreakInfiniteLoop:
+            pass
+        assert len(sent_messages) == 2, (
+            'Убедитесь, что после сбоя отправки бот досылает '
+            'неотправленные части сообщения.'
+        )
+        assert len(set(sent_messages)) == len(sent_messages), (
+            'Убедитесь, что после сбоя отправки бот не отправляет '
+            'повторно уже отправленные части сообщения.'
+        )
+
+    def test_split_message_by_message_boundary(self, homework_module):
+        limit = homework_module.TELEGRAM_MESSAGE_LIMIT
+        messages = ['a' * (limit // 2), 'b' * (limit // 2), 'c']
+        parts = homework_module.split_message(messages)
+        assert all(len(part) <= limit for part in parts), (
+            'Убедитесь, что части сообщения не превышают лимит Telegram.'
+        )
+        assert '\n\n'.join(parts) == '\n\n'.join(messages), (
+            'Убедитесь, что сообщения делятся на части только по своим '
+            'границам и ни одно из них не теряется.'
+        )
+
+    def test_gzip_rotating_file_handler(self, tmp_path, homework_module):
+        log_file = tmp_path / 'homework.log'
+        handler = homework_module.GzipRotatingFileHandler(
+            log_file, maxBytes=100, backupCount=2, encoding='utf-8'
+        )
+        first_message = 'a' * 80
+        try:
+            for message in (first_message, 'b' * 80):
+                handler.handle(logging.makeLogRecord({'msg': message}))
+        finally:
+            handler.close()
+        archive = tmp_path / 'homework.log.1.gz'
+        assert archive.exists(), (
+            'Убедитесь, что при ротации архивная копия лога сжимается в '
+            '`<имя>.1.gz`.'
+        )
+        with gzip.open(archive, 'rt', encoding='utf-8') as archive_file:
+            assert archive_file.read() == first_message + '\n'
+
+    def test_gzip_rotating_file_handler_without_source(self, tmp_path,
+                                                       homework_module):
+        log_file = tmp_path / 'homework.log'
+        handler = homework_module.GzipRotatingFileHandler(
+            log_file, maxBytes=100, backupCount=2, encoding='utf-8'
+        )
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'message'}))
+            log_file.unlink()
+            handler.doRollover()
+        finally:
+            handler.close()
+        assert not (tmp_path / 'homework.log.1.gz').exists()
+
+    def prepare_main_for_stop(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, '_stop_requested', False)
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        return inspect.unwrap(homework_module.main)
+
+    @pytest.mark.skipif(
+        platform.system() == 'Windows', reason='SIGTERM is POSIX-only'
+    )
+    def test_main_stops_on_sigterm_during_sleep(self, monkeypatch,
+                                                random_timestamp,
+                                                homework_module):
+        main = self.prepare_main_for_stop(monkeypatch, homework_module)
+        monkeypatch.setattr(
+            requests,
+            'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp=random_timestamp,
+                http_status=HTTPStatus.OK,
+                data=None
+            )
+        )
+        sleep_calls = []
+
+        def sleep_with_sigterm(secs):
+            sleep_calls.append(secs)
+            os.kill(os.getpid(), signal.SIGTERM)
+            old_sleep(1)
+
+        monkeypatch.setattr(time, 'sleep', sleep_with_sigterm)
+        previous_handler = signal.signal(
+            signal.SIGTERM, homework_module.handle_stop_signal
+        )
+        try:
+            main()
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+        assert sleep_calls == [self.RETRY_PERIOD], (
+            'Убедитесь, что сигнал SIGTERM прерывает ожидание '
+            '`time.sleep(RETRY_PERIOD)` и бот завершает работу.'
+        )
+
+    def test_main_finishes_poll_when_stop_requested(self, monkeypatch,
+                                                    random_timestamp,
+                                                    homework_module):
+        main = self.prepare_main_for_stop(monkeypatch, homework_module)
+
+        def mock_response_get_with_stop(*args, **kwargs):
+            homework_module.handle_stop_signal(signal.SIGTERM, None)
+            return utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get_with_stop)
+        sent_messages = []
+
+        def mock_send_message(bot, message=''):
+            sent_messages.append(message)
+            return True
+
+        monkeypatch.setattr(
+            homework_module,
+            'send_message',
+            mock_send_message
+        )
+        sleep_calls = []
+        monkeypatch.setattr(time, 'sleep', sleep_calls.append)
+        main()
+        assert sent_messages, (
+            'Убедитесь, что сигнал остановки не прерывает начатый опрос API '
+            'и отправку сообщения.'
+        )
+        assert not sleep_calls, (
+            'Убедитесь, что после сигнала остановки бот не ждёт следующего '
+            'опроса.'
+        )
+
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             utils.check_docstring(homework_module, func)